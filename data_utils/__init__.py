@@ -3,38 +3,291 @@ Data utilities module for Week 4 Coding Exercise.
 
 This module provides utility functions for data manipulation and analysis
 using pandas. It demonstrates proper module organization following PEP-8.
+
+pandas, numpy and the optional accelerators (pyarrow, numba) are imported
+inside the functions that use them, so importing this module stays cheap.
 """
 
-import pandas as pd
-import numpy as np
+import csv
+import importlib.util
+import os
+from collections import OrderedDict
+
+# Parsed CSVs keyed on (realpath, mtime_ns, size), most recent last.
+# Entries are (frame, nbytes); the total is kept under the byte budget.
+_LOAD_CACHE = OrderedDict()
+_LOAD_CACHE_MAX_BYTES = 256 << 20
+
+# Extensions pandas decompresses transparently; pyarrow's path skips them.
+_COMPRESSED_SUFFIXES = (
+    '.gz', '.bz2', '.zip', '.xz', '.zst', '.tar', '.tgz',
+)
+
+# Parquet schema metadata key recording the CSV a sidecar came from.
+_SIDECAR_SOURCE_KEY = b'h501_source'
+
+# pandas' default ``na_values``; pyarrow's built-in list differs from it.
+_CSV_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+]
+
+# Ceiling on the per-thread partials allocated by groupby_kernel.
+_NUMBA_GROUPBY_BUFFER_BYTES = 64 << 20
+
+_SUMMARY_STATS = ['count', 'mean', 'std', 'min', 'max']
+
+_VALID_AGG_FUNCS = frozenset({'mean', 'sum', 'count', 'min', 'max'})
+
+
+def _has_module(name):
+    """Return True if ``name`` is importable, without importing it."""
+    return importlib.util.find_spec(name) is not None
 
 
-def load_data(filepath):
+def _is_local_path(filepath):
+    """Return True for a str or os.PathLike naming a local file."""
+    if not isinstance(filepath, (str, os.PathLike)):
+        return False
+    return '://' not in os.fspath(filepath)
+
+
+def _csv_column_names(filepath):
+    """Read the header row, deduplicating names like ``pd.read_csv``."""
+    with open(filepath, newline='', encoding='utf-8-sig') as handle:
+        header = next(csv.reader(handle), [])
+
+    names = []
+    seen = set()
+    for i, name in enumerate(header):
+        name = name or f"Unnamed: {i}"
+        candidate = name
+        suffix = 0
+        while candidate in seen:
+            suffix += 1
+            candidate = f"{name}.{suffix}"
+        seen.add(candidate)
+        names.append(candidate)
+    return names
+
+
+def _read_csv_arrow(filepath):
+    """Parse a plain local CSV with pyarrow, or return None to defer."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    try:
+        names = _csv_column_names(filepath)
+    except UnicodeDecodeError:
+        return None
+    # skip_rows counts physical lines, so a quoted header spanning
+    # several lines would misalign the data; leave it to pandas.
+    if not names or any('\n' in name or '\r' in name for name in names):
+        return None
+
+    # Match pd.read_csv: its NA strings and boolean spellings, mangled
+    # duplicate headers, and no date or time inference.
+    read_options = pacsv.ReadOptions(
+        column_names=names, skip_rows=1, block_size=8 << 20,
+        use_threads=True
+    )
+    convert_options = pacsv.ConvertOptions(
+        null_values=_CSV_NA_VALUES, strings_can_be_null=True,
+        true_values=['True', 'TRUE', 'true'],
+        false_values=['False', 'FALSE', 'false']
+    )
+    try:
+        table = pacsv.read_csv(filepath, read_options=read_options,
+                               convert_options=convert_options)
+        # pyarrow always infers dates and times, which pandas leaves as
+        # text, and types all-empty columns as null, which pandas reads
+        # as float NaN. Re-read any such columns with pandas' types.
+        overrides = {}
+        for field in table.schema:
+            if pa.types.is_temporal(field.type):
+                overrides[field.name] = pa.string()
+            elif pa.types.is_null(field.type):
+                overrides[field.name] = pa.float64()
+        if overrides:
+            convert_options.column_types = overrides
+            table = pacsv.read_csv(filepath, read_options=read_options,
+                                   convert_options=convert_options)
+    except pa.ArrowInvalid:
+        # e.g. short rows, which pandas pads with NaN instead.
+        return None
+    return table
+
+
+def _read_csv(filepath, parquet_cache=False):
+    """Parse a whole CSV file, preferring pyarrow when it applies."""
+    import pandas as pd
+
+    use_arrow = (
+        _is_local_path(filepath)
+        and not os.fspath(filepath).lower().endswith(_COMPRESSED_SUFFIXES)
+        and _has_module('pyarrow')
+    )
+    if use_arrow:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File {filepath} not found.")
+        # Identify the CSV exactly, as the in-memory cache key does; an
+        # mtime comparison alone misses files restored with old times.
+        source = f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+        sidecar = f"{os.fspath(filepath)}.parquet"
+        if parquet_cache:
+            try:
+                metadata = pq.read_schema(sidecar).metadata or {}
+                if metadata.get(_SIDECAR_SOURCE_KEY) == source:
+                    return pq.read_table(sidecar, memory_map=True).to_pandas()
+            except (OSError, pa.ArrowInvalid):
+                pass  # Missing or unreadable sidecar: re-parse the CSV.
+
+        try:
+            table = _read_csv_arrow(filepath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File {filepath} not found.")
+        if table is not None:
+            if parquet_cache:
+                metadata = dict(table.schema.metadata or {})
+                metadata[_SIDECAR_SOURCE_KEY] = source
+                try:
+                    pq.write_table(table.replace_schema_metadata(metadata),
+                                   sidecar, compression='snappy')
+                except OSError:
+                    pass  # A read-only directory just means no sidecar.
+            return table.to_pandas()
+
+    try:
+        data = pd.read_csv(filepath)
+        return data
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File {filepath} not found.")
+    except pd.errors.ParserError:
+        raise ValueError(f"Error parsing CSV file: {filepath}")
+
+
+def _copy_for_caller(df):
+    """Copy ``df`` so changes to the copy never reach the original."""
+    import pandas as pd
+
+    # Under copy-on-write a shallow copy is already independent.
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return df.copy(deep=False)
+    if getattr(pd.options.mode, 'copy_on_write', False) is True:
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def _cache_frame(key, df):
+    """Store a parsed frame in the load cache, evicting to fit."""
+    nbytes = int(df.memory_usage(index=True, deep=True).sum())
+    if nbytes > _LOAD_CACHE_MAX_BYTES:
+        return
+    _LOAD_CACHE[key] = (df, nbytes)
+    total = sum(size for _, size in _LOAD_CACHE.values())
+    while total > _LOAD_CACHE_MAX_BYTES:
+        _, (_, size) = _LOAD_CACHE.popitem(last=False)
+        total -= size
+
+
+def _downcast_numeric(df):
+    """Shrink numeric columns to the smallest dtype holding their values."""
+    import pandas as pd
+
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes('floating').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
+
+
+def load_data(filepath, chunksize=None, downcast=False, parquet_cache=False):
     """
     Load data from a CSV file.
 
+    When pyarrow is installed, plain uncompressed local files are
+    parsed with its multithreaded CSV reader, which is considerably
+    faster on large files. It is configured to follow ``pd.read_csv``'s
+    defaults for missing values, booleans, dates and duplicate column
+    names; files it cannot parse that way, and all other inputs, are
+    read with ``pd.read_csv``. Parsed files are cached in memory, up to
+    256 MiB in total, until their modification time or size changes,
+    so repeated loads of the same file return a copy without
+    re-parsing.
+
     Parameters
     ----------
-    filepath : str
-        Path to the CSV file to load.
+    filepath : str, os.PathLike or file-like
+        Path to the CSV file to load. URLs and open file objects are
+        passed straight to ``pd.read_csv`` and are not cached.
+    chunksize : int, optional
+        If given, return an iterator yielding DataFrames of at most
+        this many rows instead of reading the whole file into memory.
+        Pair it with ``aggregate_streaming`` for files larger than RAM.
+    downcast : bool, default=False
+        If True, downcast integer and float columns to the smallest
+        dtype that holds their values (e.g. int8, float32). This cuts
+        memory use for every later operation on the frame. It is
+        ignored when ``chunksize`` is given.
+    parquet_cache : bool, default=False
+        If True and pyarrow is installed, keep a ``<filepath>.parquet``
+        sidecar next to the CSV. It is written on the first load and
+        read instead of the CSV while the CSV's modification time and
+        size are exactly those recorded in it, which avoids
+        re-tokenizing the text. Ignored when ``chunksize`` is given.
 
     Returns
     -------
-    pd.DataFrame
-        DataFrame containing the loaded data.
+    pd.DataFrame or pandas.io.parsers.TextFileReader
+        DataFrame containing the loaded data, or an iterator over
+        DataFrame chunks when ``chunksize`` is given.
 
     Examples
     --------
     >>> df = load_data('data.csv')
     >>> print(df.head())
+    >>> chunks = load_data('big.csv', chunksize=100_000)
+    >>> result = aggregate_streaming(chunks, 'category', 'value', 'sum')
     """
-    try:
-        data = pd.read_csv(filepath)
+    import pandas as pd
+
+    if chunksize is not None:
+        try:
+            return pd.read_csv(filepath, chunksize=chunksize, iterator=True)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File {filepath} not found.")
+
+    if not _is_local_path(filepath):
+        # Buffers and URLs have no stable identity to cache on.
+        data = _read_csv(filepath)
+        if downcast:
+            data = _downcast_numeric(data)
         return data
+
+    try:
+        stat = os.stat(filepath)
     except FileNotFoundError:
         raise FileNotFoundError(f"File {filepath} not found.")
-    except pd.errors.ParserError:
-        raise ValueError(f"Error parsing CSV file: {filepath}")
+
+    key = (os.path.realpath(filepath), stat.st_mtime_ns, stat.st_size)
+    if key in _LOAD_CACHE:
+        _LOAD_CACHE.move_to_end(key)
+        data = _copy_for_caller(_LOAD_CACHE[key][0])
+    else:
+        data = _read_csv(filepath, parquet_cache)
+        _cache_frame(key, data)
+        if key in _LOAD_CACHE:
+            data = _copy_for_caller(data)
+
+    if downcast:
+        data = _downcast_numeric(data)
+    return data
 
 
 def clean_data(df):
@@ -56,12 +309,32 @@ def clean_data(df):
     >>> df_clean = clean_data(df)
     >>> print(df_clean.info())
     """
-    df_clean = df.drop_duplicates()
-    df_clean = df_clean.dropna()
-    return df_clean
+    # Build one keep-mask and take once instead of materialising an
+    # intermediate deduplicated copy before dropping NaN rows.
+    mask = ~df.duplicated(keep='first') & df.notna().all(axis=1)
+    if mask.all():
+        # Nothing to drop: skip the take, but still hand back a frame
+        # callers cannot mutate their input through.
+        return _copy_for_caller(df)
+    return df.loc[mask]
+
+
+def _numeric_stats_numba(numeric):
+    """Count, mean, std, min and max per column from one numba pass."""
+    import numpy as np
+    import pandas as pd
+
+    from ._kernels import describe_kernel
 
+    # One contiguous row per column keeps each reduction sequential.
+    columns = np.ascontiguousarray(
+        numeric.to_numpy(dtype=np.float64, na_value=np.nan).T
+    )
+    return pd.DataFrame(describe_kernel(columns), index=_SUMMARY_STATS,
+                        columns=numeric.columns)
 
-def summarize_data(df):
+
+def summarize_data(df, quantiles=False, engine=None):
     """
     Generate summary statistics for a DataFrame.
 
@@ -69,6 +342,15 @@ def summarize_data(df):
     ----------
     df : pd.DataFrame
         DataFrame to summarize.
+    quantiles : bool, default=False
+        Whether to include the 25%, 50% and 75% quantiles in
+        ``numeric_stats``. These need a sort per column, so they are
+        skipped unless requested.
+    engine : str, optional
+        Set to 'numba' to compute count, mean, std, min and max in a
+        single parallel JIT-compiled pass instead of pandas. Requires
+        numba. The first call pays a one-off compile cost and every
+        numeric column is copied to float64.
 
     Returns
     -------
@@ -79,13 +361,38 @@ def summarize_data(df):
     --------
     >>> summary = summarize_data(df)
     >>> print(summary)
+    >>> summary = summarize_data(df, engine='numba')
     """
+    if engine not in (None, 'numba'):
+        raise ValueError("engine must be None or 'numba'")
+    if engine == 'numba' and not _has_module('numba'):
+        raise ImportError("engine='numba' requires numba to be installed.")
+
+    import pandas as pd
+
+    counts = df.count()
+    numeric = df.select_dtypes('number')
+    if numeric.columns.empty:
+        # agg() has nothing to concatenate without numeric columns.
+        stats = pd.DataFrame(index=_SUMMARY_STATS)
+    elif engine == 'numba':
+        stats = _numeric_stats_numba(numeric)
+    else:
+        stats = numeric.agg(_SUMMARY_STATS)
+    if quantiles and not numeric.columns.empty:
+        stats = pd.concat([
+            stats,
+            numeric.quantile([0.25, 0.5, 0.75]).rename(
+                index=lambda q: f"{q:.0%}"
+            ),
+        ])
+
     summary = {
         'rows': len(df),
         'columns': len(df.columns),
-        'missing_values': df.isnull().sum().sum(),
+        'missing_values': int(df.size - counts.sum()),
         'dtypes': df.dtypes.to_dict(),
-        'numeric_stats': df.describe().to_dict()
+        'numeric_stats': stats.to_dict()
     }
     return summary
 
@@ -115,10 +422,124 @@ def filter_data(df, column, value):
     """
     if column not in df.columns:
         raise ValueError(f"Column '{column}' not found in DataFrame.")
-    return df[df[column] == value]
-
 
-def aggregate_data(df, group_col, agg_col, agg_func='mean'):
+    import pandas as pd
+
+    series = df[column]
+    # Categorical columns compare far faster on their integer codes.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        try:
+            code = series.cat.categories.get_loc(value)
+        except KeyError:
+            return df.iloc[:0]
+        return df.iloc[series.cat.codes.to_numpy() == code]
+
+    return df[series == value]
+
+
+def _aggregate_numba(df, group_col, agg_col, agg_func):
+    """Group and aggregate with the numba kernel instead of pandas."""
+    if not _has_module('numba'):
+        raise ImportError("engine='numba' requires numba to be installed.")
+
+    import numpy as np
+    import pandas as pd
+
+    import numba
+
+    from ._kernels import groupby_kernel
+
+    column = df[agg_col]
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+        # float64 holds integers exactly only up to 2**53, which bounds
+        # both the values themselves and any sum over the column.
+        info = np.iinfo(dtype)
+        bound = max(abs(int(info.min)), int(info.max))
+        if agg_func in ('sum', 'mean'):
+            bound *= len(column)
+        exact = bound < 2 ** 53
+    else:
+        exact = isinstance(dtype, np.dtype) and dtype.kind == 'f'
+    if not exact:
+        # Strings, bools, extension dtypes and wide integers stay with
+        # pandas, which keeps them exact and in their own dtype.
+        return df.groupby(group_col, observed=True)[agg_col].agg(agg_func)
+
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    ngroups = len(uniques)
+    # Four float64-sized buffers per group and thread; use fewer threads
+    # rather than letting high-cardinality keys exhaust memory.
+    nthreads = max(1, min(
+        numba.get_num_threads(),
+        _NUMBA_GROUPBY_BUFFER_BYTES // (32 * max(ngroups, 1)),
+    ))
+    values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+    sums, counts, mins, maxs = groupby_kernel(
+        codes.astype(np.int64, copy=False), values, ngroups, nthreads
+    )
+
+    empty = counts == 0
+    if agg_func == 'count':
+        result = counts
+    elif agg_func == 'sum':
+        result = sums
+    elif agg_func == 'mean':
+        result = np.where(empty, np.nan, sums / np.maximum(counts, 1))
+    elif agg_func == 'min':
+        result = np.where(empty, np.nan, mins)
+    else:
+        result = np.where(empty, np.nan, maxs)
+
+    # Match the dtypes pandas groupby would return.
+    if agg_func == 'count':
+        pass
+    elif dtype.kind == 'f':
+        result = result.astype(dtype, copy=False)
+    elif agg_func == 'sum':
+        result = result.astype(np.int64 if dtype.kind == 'i' else np.uint64)
+    elif agg_func in ('min', 'max'):
+        result = result.astype(dtype)
+
+    index = pd.Index(uniques, name=group_col)
+    return pd.Series(result, index=index, name=agg_col)
+
+
+def _aggregate_presorted(df, group_col, agg_col, agg_func):
+    """Sum, count or mean over contiguous runs of equal group keys."""
+    import numpy as np
+    import pandas as pd
+
+    keys = df[group_col].to_numpy()
+    values = df[agg_col]
+    valid = values.notna().to_numpy()
+    values = values.to_numpy()
+    if not valid.all():
+        values = np.where(valid, values, 0)
+
+    starts = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1]
+    counts = np.add.reduceat(valid.astype(np.int64), starts)
+    if agg_func == 'count':
+        result = counts
+    else:
+        # Accumulate narrow integers in int64 so sums cannot overflow.
+        acc_dtype = np.int64 if values.dtype.kind in 'biu' else None
+        result = np.add.reduceat(values, starts, dtype=acc_dtype)
+        if agg_func == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = result / counts
+            if values.dtype.kind == 'f':
+                # pandas keeps float32 means in float32.
+                result = result.astype(values.dtype, copy=False)
+
+    # Take keys from the column itself so categorical keys keep a
+    # CategoricalIndex, as groupby(observed=True) would return.
+    index = pd.Index(df[group_col].iloc[starts], name=group_col)
+    return pd.Series(result, index=index, name=agg_col)
+
+
+def aggregate_data(df, group_col, agg_col, agg_func='mean', engine=None,
+                   presorted=False):
     """
     Aggregate data by grouping on one column.
 
@@ -132,6 +553,18 @@ def aggregate_data(df, group_col, agg_col, agg_func='mean'):
         Column to aggregate.
     agg_func : str, default='mean'
         Aggregation function ('mean', 'sum', 'count', 'min', 'max').
+    engine : str, optional
+        Set to 'numba' to aggregate with a parallel JIT-compiled kernel
+        instead of pandas groupby. Requires numba. Faster on large
+        frames, but the first call pays a one-off compile cost.
+        Only float columns and integer columns that float64 holds
+        exactly use the kernel; bool, extension, wide integer and
+        non-numeric columns always use pandas groupby.
+    presorted : bool, default=False
+        Set to True when ``df`` is already sorted by ``group_col``.
+        'sum', 'count' and 'mean' are then computed with
+        ``np.add.reduceat`` over each run of equal keys, which skips
+        building a hash table.
 
     Returns
     -------
@@ -142,12 +575,83 @@ def aggregate_data(df, group_col, agg_col, agg_func='mean'):
     --------
     >>> result = aggregate_data(df, 'category', 'value', 'sum')
     >>> print(result)
+    >>> result = aggregate_data(df, 'category', 'value', engine='numba')
+    """
+    if agg_func not in _VALID_AGG_FUNCS:
+        raise ValueError(
+            f"agg_func must be one of {sorted(_VALID_AGG_FUNCS)}"
+        )
+
+    if engine not in (None, 'numba'):
+        raise ValueError("engine must be None or 'numba'")
+
+    if (presorted and agg_func in ('sum', 'count', 'mean') and len(df)
+            and not df[group_col].isna().any()):
+        return _aggregate_presorted(df, group_col, agg_col, agg_func)
+    if engine == 'numba':
+        return _aggregate_numba(df, group_col, agg_col, agg_func)
+
+    return df.groupby(group_col, observed=True)[agg_col].agg(agg_func)
+
+
+def aggregate_streaming(chunks, group_col, agg_col, agg_func='mean'):
     """
-    valid_funcs = ['mean', 'sum', 'count', 'min', 'max']
-    if agg_func not in valid_funcs:
-        raise ValueError(f"agg_func must be one of {valid_funcs}")
+    Aggregate data from an iterator of DataFrame chunks.
 
-    return df.groupby(group_col)[agg_col].agg(agg_func)
+    Each chunk is reduced to one partial result per group, so peak
+    memory is bounded by the chunk size plus the number of groups
+    rather than by the size of the whole dataset.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        Chunks to aggregate, e.g. from ``load_data(path, chunksize=n)``.
+    group_col : str
+        Column to group by.
+    agg_col : str
+        Column to aggregate.
+    agg_func : str, default='mean'
+        Aggregation function ('mean', 'sum', 'count', 'min', 'max').
+
+    Returns
+    -------
+    pd.Series
+        Aggregated data, equal to ``aggregate_data`` on the full frame.
+
+    Examples
+    --------
+    >>> chunks = load_data('big.csv', chunksize=100_000)
+    >>> result = aggregate_streaming(chunks, 'category', 'value', 'mean')
+    >>> print(result)
+    """
+    import pandas as pd
+
+    if agg_func not in _VALID_AGG_FUNCS:
+        raise ValueError(
+            f"agg_func must be one of {sorted(_VALID_AGG_FUNCS)}"
+        )
+
+    # A mean of chunk means is wrong when chunks differ in size, so
+    # carry per-group sums and counts and divide once at the end.
+    partial_funcs = ['sum', 'count'] if agg_func == 'mean' else [agg_func]
+    partials = [
+        chunk.groupby(group_col, observed=True)[agg_col].agg(partial_funcs)
+        for chunk in chunks
+    ]
+    if not partials:
+        return pd.Series(dtype=float, name=agg_col)
+
+    combined = pd.concat(partials).groupby(level=0, observed=True)
+    if agg_func == 'mean':
+        totals = combined.sum()
+        result = totals['sum'] / totals['count']
+    elif agg_func in ('sum', 'count'):
+        result = combined[agg_func].sum()
+    else:
+        result = combined[agg_func].agg(agg_func)
+    result.index.name = group_col
+    result.name = agg_col
+    return result
 
 
 def create_sample_data(n_rows=100):
@@ -169,11 +673,15 @@ def create_sample_data(n_rows=100):
     >>> sample_df = create_sample_data(50)
     >>> print(sample_df.head())
     """
-    np.random.seed(42)
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(42)
     categories = ['A', 'B', 'C']
+    codes = rng.integers(0, len(categories), n_rows, dtype=np.int8)
     data = {
-        'category': np.random.choice(categories, n_rows),
-        'value': np.random.normal(100, 15, n_rows),
-        'count': np.random.randint(1, 100, n_rows)
+        'category': pd.Categorical.from_codes(codes, categories),
+        'value': rng.normal(100, 15, n_rows).astype(np.float32),
+        'count': rng.integers(1, 100, n_rows, dtype=np.int8)
     }
     return pd.DataFrame(data)
@@ -0,0 +1,78 @@
+"""
+Numba kernels backing the ``engine='numba'`` paths in ``data_utils``.
+
+This module imports numba at the top level, so it is only imported
+on demand once numba is known to be installed.
+"""
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True, parallel=True)
+def groupby_kernel(codes, values, ngroups, nthreads):
+    """Per-group sum, count, min and max of ``values`` in one pass."""
+    n = len(codes)
+    step = (n + nthreads - 1) // nthreads
+    # Each thread scatters into its own row, so no atomics needed.
+    sums = np.zeros((nthreads, ngroups))
+    counts = np.zeros((nthreads, ngroups), dtype=np.int64)
+    mins = np.full((nthreads, ngroups), np.inf)
+    maxs = np.full((nthreads, ngroups), -np.inf)
+    for t in numba.prange(nthreads):
+        for i in range(t * step, min(n, (t + 1) * step)):
+            code = codes[i]
+            val = values[i]
+            if code < 0 or np.isnan(val):
+                continue
+            sums[t, code] += val
+            counts[t, code] += 1
+            if val < mins[t, code]:
+                mins[t, code] = val
+            if val > maxs[t, code]:
+                maxs[t, code] = val
+
+    total_sum = np.zeros(ngroups)
+    total_count = np.zeros(ngroups, dtype=np.int64)
+    total_min = np.full(ngroups, np.inf)
+    total_max = np.full(ngroups, -np.inf)
+    for t in range(nthreads):
+        for g in range(ngroups):
+            total_sum[g] += sums[t, g]
+            total_count[g] += counts[t, g]
+            total_min[g] = min(total_min[g], mins[t, g])
+            total_max[g] = max(total_max[g], maxs[t, g])
+    return total_sum, total_count, total_min, total_max
+
+
+@numba.njit(cache=True, parallel=True)
+def describe_kernel(columns):
+    """Count, mean, std, min and max of each row of ``columns``."""
+    ncols, nrows = columns.shape
+    out = np.full((5, ncols), np.nan)
+    for j in numba.prange(ncols):
+        # Welford's update keeps mean and variance stable in one pass.
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        lo = np.inf
+        hi = -np.inf
+        for i in range(nrows):
+            val = columns[j, i]
+            if np.isnan(val):
+                continue
+            count += 1
+            delta = val - mean
+            mean += delta / count
+            m2 += delta * (val - mean)
+            lo = min(lo, val)
+            hi = max(hi, val)
+
+        out[0, j] = count
+        if count > 0:
+            out[1, j] = mean
+            out[3, j] = lo
+            out[4, j] = hi
+        if count > 1:
+            out[2, j] = np.sqrt(m2 / (count - 1))
+    return out
@@ -4,29 +4,88 @@ Visualization module for Week 4 Coding Exercise.
 This module provides utility functions for data visualization
 using Seaborn. It demonstrates proper module organization and
 integration with pandas DataFrames.
+
+matplotlib, seaborn, numpy and pandas are imported inside the functions
+that use them, so importing this module stays cheap.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+import os
+import sys
+
+# Scatter plots with more points than this are drawn as a raster image.
+_RASTERIZE_THRESHOLD = 10_000
+
+# Heatmaps with more columns than this are drawn without cell labels.
+_ANNOTATE_MAX_COLUMNS = 20
+
+
+def _pyplot():
+    """Import pyplot on first use, choosing Agg when running headless."""
+    if 'matplotlib.pyplot' not in sys.modules:
+        import matplotlib
+
+        # Without a display, skip probing GUI backends (Tk/Qt). An
+        # explicit MPLBACKEND, e.g. the one Jupyter sets, always wins.
+        if (sys.platform.startswith('linux')
+                and not os.environ.get('DISPLAY')
+                and not os.environ.get('WAYLAND_DISPLAY')
+                and not os.environ.get('MPLBACKEND')):
+            matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _seaborn():
+    """Import seaborn, making sure the backend is chosen first."""
+    # seaborn imports pyplot itself, which would lock in the backend.
+    _pyplot()
+    import seaborn as sns
+    return sns
 
 
 def setup_style():
     """
     Set up Seaborn style for consistent visualizations.
 
-    This function sets the Seaborn style to 'darkgrid' and
-    increases the figure size for better readability.
+    This function sets the Seaborn style to 'darkgrid'. Figure sizes
+    are chosen per plot, so global rcParams are left untouched.
 
     Examples
     --------
     >>> setup_style()
     """
+    sns = _seaborn()
     sns.set_style("darkgrid")
-    plt.rcParams['figure.figsize'] = (12, 6)
 
 
-def plot_distribution(data, column, title=None, bins=30):
+def _kde_curve(values, gridsize=512):
+    """Gaussian KDE evaluated by binning then convolving on a grid."""
+    import numpy as np
+
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n < 2:
+        return None
+    # Scott's rule, the same bandwidth seaborn uses by default.
+    bandwidth = values.std(ddof=1) * n ** (-1 / 5)
+    if bandwidth == 0:
+        return None
+
+    lo = values.min() - 3 * bandwidth
+    hi = values.max() + 3 * bandwidth
+    counts, edges = np.histogram(values, bins=gridsize, range=(lo, hi))
+    step = edges[1] - edges[0]
+    half = min(int(np.ceil(3 * bandwidth / step)), gridsize // 2 - 1)
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    density = np.convolve(counts, kernel, mode='same') / (n * step)
+    grid = (edges[:-1] + edges[1:]) / 2
+    return grid, density
+
+
+def plot_distribution(data, column, title=None, bins=30, kde=False, ax=None):
     """
     Create a distribution plot for a single column.
 
@@ -40,6 +99,12 @@ def plot_distribution(data, column, title=None, bins=30):
         Title for the plot. If None, uses column name.
     bins : int, default=30
         Number of bins for the histogram.
+    kde : bool, default=False
+        Whether to overlay a kernel density estimate. It is computed
+        on a fixed 512-point grid, so the cost stays linear in the
+        number of rows.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on. If None, a new figure and axes are created.
 
     Returns
     -------
@@ -51,25 +116,47 @@ def plot_distribution(data, column, title=None, bins=30):
     >>> ax = plot_distribution(df, 'value', title='Value Distribution')
     >>> plt.show()
     """
+    import numpy as np
+
+    plt = _pyplot()
+    sns = _seaborn()
+
     if column not in data.columns:
         raise ValueError(f"Column '{column}' not found in DataFrame.")
 
     if title is None:
         title = f"Distribution of {column}"
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.histplot(data=data, x=column, bins=bins, kde=True, ax=ax)
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+    # Remember where this histogram's bars start: a caller-supplied ax
+    # may already hold patches from earlier plots.
+    first_patch = len(ax.patches)
+    sns.histplot(data=data, x=column, bins=bins, ax=ax)
+    if kde:
+        values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        curve = _kde_curve(values)
+        if curve is not None:
+            grid, density = curve
+            finite = values[~np.isnan(values)]
+            bin_width = (finite.max() - finite.min()) / bins
+            bars = ax.patches[first_patch:]
+            color = bars[0].get_facecolor()[:3] if bars else None
+            ax.plot(grid, density * len(finite) * bin_width, color=color)
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel(column, fontsize=12)
     ax.set_ylabel('Frequency', fontsize=12)
-    plt.tight_layout()
+    ax.figure.tight_layout()
     return ax
 
 
-def plot_scatter(data, x, y, hue=None, title=None):
+def plot_scatter(data, x, y, hue=None, title=None, ax=None):
     """
     Create a scatter plot for two columns.
 
+    Plots with more than 10,000 points use smaller, semi-transparent
+    markers that are rasterized rather than drawn as vector paths.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -82,6 +169,8 @@ def plot_scatter(data, x, y, hue=None, title=None):
         Column name for color encoding.
     title : str, optional
         Title for the plot.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on. If None, a new figure and axes are created.
 
     Returns
     -------
@@ -93,6 +182,9 @@ def plot_scatter(data, x, y, hue=None, title=None):
     >>> ax = plot_scatter(df, 'value', 'count', hue='category')
     >>> plt.show()
     """
+    plt = _pyplot()
+    sns = _seaborn()
+
     for col in [x, y]:
         if col not in data.columns:
             raise ValueError(f"Column '{col}' not found in DataFrame.")
@@ -103,16 +195,23 @@ def plot_scatter(data, x, y, hue=None, title=None):
     if title is None:
         title = f"{y} vs {x}"
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.scatterplot(data=data, x=x, y=y, hue=hue, ax=ax, s=100)
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+    if len(data) > _RASTERIZE_THRESHOLD:
+        # One vector marker per row makes large plots slow to render
+        # and bloats PDF/SVG output, so rasterize the points instead.
+        sns.scatterplot(data=data, x=x, y=y, hue=hue, ax=ax, s=10,
+                        alpha=0.5, rasterized=True)
+    else:
+        sns.scatterplot(data=data, x=x, y=y, hue=hue, ax=ax, s=100)
     ax.set_title(title, fontsize=14, fontweight='bold')
     ax.set_xlabel(x, fontsize=12)
     ax.set_ylabel(y, fontsize=12)
-    plt.tight_layout()
+    ax.figure.tight_layout()
     return ax
 
 
-def plot_boxplot(data, x=None, y=None, title=None):
+def plot_boxplot(data, x=None, y=None, title=None, ax=None):
     """
     Create a box plot to show distribution by category.
 
@@ -126,6 +225,8 @@ def plot_boxplot(data, x=None, y=None, title=None):
         Column name for y-axis (numeric).
     title : str, optional
         Title for the plot.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on. If None, a new figure and axes are created.
 
     Returns
     -------
@@ -137,6 +238,9 @@ def plot_boxplot(data, x=None, y=None, title=None):
     >>> ax = plot_boxplot(df, x='category', y='value')
     >>> plt.show()
     """
+    plt = _pyplot()
+    sns = _seaborn()
+
     if x and x not in data.columns:
         raise ValueError(f"Column '{x}' not found in DataFrame.")
     if y and y not in data.columns:
@@ -145,21 +249,25 @@ def plot_boxplot(data, x=None, y=None, title=None):
     if title is None:
         title = f"{y} by {x}" if x else f"Box Plot of {y}"
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
     sns.boxplot(data=data, x=x, y=y, ax=ax)
     ax.set_title(title, fontsize=14, fontweight='bold')
     if x:
         ax.set_xlabel(x, fontsize=12)
     if y:
         ax.set_ylabel(y, fontsize=12)
-    plt.tight_layout()
+    ax.figure.tight_layout()
     return ax
 
 
-def plot_heatmap(data, title=None, cmap='coolwarm'):
+def plot_heatmap(data, title=None, cmap='coolwarm', ax=None):
     """
     Create a correlation heatmap for numeric columns.
 
+    Cells are labelled with their correlation only when there are at
+    most 20 numeric columns; wider matrices are drawn unlabelled.
+
     Parameters
     ----------
     data : pd.DataFrame
@@ -168,6 +276,8 @@ def plot_heatmap(data, title=None, cmap='coolwarm'):
         Title for the plot.
     cmap : str, default='coolwarm'
         Colormap for the heatmap.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on. If None, a new figure and axes are created.
 
     Returns
     -------
@@ -179,19 +289,57 @@ def plot_heatmap(data, title=None, cmap='coolwarm'):
     >>> ax = plot_heatmap(df, title='Correlation Matrix')
     >>> plt.show()
     """
+    import numpy as np
+    import pandas as pd
+
+    plt = _pyplot()
+
     if title is None:
         title = "Correlation Heatmap"
 
-    corr_matrix = data.corr(numeric_only=True)
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap=cmap, ax=ax,
-                cbar_kws={'label': 'Correlation'})
+    # Same columns as DataFrame.corr(numeric_only=True), bools included.
+    numeric = data.select_dtypes(['number', 'bool', 'boolean'])
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any():
+        # np.corrcoef has no pairwise NaN handling, so defer to pandas.
+        corr_matrix = numeric.corr()
+    else:
+        # Centre in float64 first: large offsets such as epoch seconds
+        # would otherwise swamp the variance once cast to float32.
+        values = np.ascontiguousarray(
+            (values - values.mean(axis=0)).T, dtype=np.float32
+        )
+        # Constant columns have zero variance; report NaN quietly, as
+        # pandas does, instead of warning about the division.
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = np.corrcoef(values, dtype=np.float32)
+        corr_matrix = pd.DataFrame(corr, index=numeric.columns,
+                                   columns=numeric.columns)
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 8))
+    image = ax.imshow(corr_matrix.to_numpy(), cmap=cmap, vmin=-1, vmax=1)
+    ax.figure.colorbar(image, ax=ax, label='Correlation')
+    ticks = range(len(corr_matrix.columns))
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(corr_matrix.columns, rotation=90)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels(corr_matrix.columns)
+    ax.grid(False)
+
+    # One Text artist per cell dominates render time on wide frames.
+    if len(corr_matrix.columns) <= _ANNOTATE_MAX_COLUMNS:
+        for (i, j), value in np.ndenumerate(corr_matrix.to_numpy()):
+            if np.isnan(value):
+                continue
+            color = 'white' if abs(value) > 0.5 else 'black'
+            ax.text(j, i, f"{value:.2f}", ha='center', va='center',
+                    color=color)
     ax.set_title(title, fontsize=14, fontweight='bold')
-    plt.tight_layout()
+    ax.figure.tight_layout()
     return ax
 
 
-def plot_categorical(data, column, title=None, orient='v'):
+def plot_categorical(data, column, title=None, orient='v', ax=None):
     """
     Create a categorical count plot.
 
@@ -205,6 +353,8 @@ def plot_categorical(data, column, title=None, orient='v'):
         Title for the plot.
     orient : str, default='v'
         Orientation of the plot ('v' for vertical, 'h' for horizontal).
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on. If None, a new figure and axes are created.
 
     Returns
     -------
@@ -216,15 +366,19 @@ def plot_categorical(data, column, title=None, orient='v'):
     >>> ax = plot_categorical(df, 'category', title='Category Counts')
     >>> plt.show()
     """
+    plt = _pyplot()
+    sns = _seaborn()
+
     if column not in data.columns:
         raise ValueError(f"Column '{column}' not found in DataFrame.")
 
     if title is None:
         title = f"Counts of {column}"
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
     sns.countplot(data=data, x=column if orient == 'v' else None,
                   y=column if orient == 'h' else None, ax=ax)
     ax.set_title(title, fontsize=14, fontweight='bold')
-    plt.tight_layout()
+    ax.figure.tight_layout()
     return ax